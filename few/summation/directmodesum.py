@@ -56,6 +56,11 @@ class DirectModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleBase):
         """Confirms GPU capability"""
         return True
 
+    @property
+    def fp32_capability(self):
+        """Confirms single precision capability"""
+        return True
+
     def sum(self, t, teuk_modes, ylms, Phi_phi, Phi_r, m_arr, n_arr, *args, **kwargs):
         """Direct summation function.
 
@@ -87,8 +92,11 @@ class DirectModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleBase):
         ylms = self.xp.asarray(ylms)
         Phi_phi = self.xp.asarray(Phi_phi)
         Phi_r = self.xp.asarray(Phi_r)
-        m_arr = self.xp.asarray(m_arr)
-        n_arr = self.xp.asarray(n_arr)
+
+        # cast mode indices to the phase precision
+        # so single precision inputs are not promoted
+        m_arr = self.xp.asarray(m_arr).astype(Phi_phi.dtype)
+        n_arr = self.xp.asarray(n_arr).astype(Phi_r.dtype)
 
         # waveform with M >= 0
         w1 = self.xp.sum(
@@ -391,8 +391,23 @@ class InterpolatedModeSum(SummationBase, SchwarzschildEccentric, ParallelModuleB
         ninterps = self.ndim + 2 * num_teuk_modes  # 2 for re and im
         y_all = self.xp.zeros((ninterps, length))
 
-        y_all[:num_teuk_modes] = teuk_modes.T.real
-        y_all[num_teuk_modes : 2 * num_teuk_modes] = teuk_modes.T.imag
+        # split the interleaved complex amplitudes into blocks of real and
+        # imaginary parts with a single pass over a float view of the input
+        # the view needs no copy if the input is contiguous in either order
+        real_dtype = teuk_modes.real.dtype
+        y_all_teuk = y_all[: 2 * num_teuk_modes].reshape(2, num_teuk_modes, length)
+
+        if teuk_modes.T.flags.c_contiguous:
+            teuk_ri = teuk_modes.T.view(real_dtype).reshape(num_teuk_modes, length, 2)
+            y_all_teuk[:] = teuk_ri.transpose(2, 0, 1)
+
+        elif teuk_modes.flags.c_contiguous:
+            teuk_ri = teuk_modes.view(real_dtype).reshape(length, num_teuk_modes, 2)
+            y_all_teuk[:] = teuk_ri.transpose(2, 1, 0)
+
+        else:
+            y_all[:num_teuk_modes] = teuk_modes.T.real
+            y_all[num_teuk_modes : 2 * num_teuk_modes] = teuk_modes.T.imag
 
         y_all[-2] = Phi_phi
         y_all[-1] = Phi_r
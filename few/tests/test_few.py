@@ -10,6 +10,7 @@ from few.utils.utility import get_overlap, get_mismatch
 from few.utils.ylm import GetYlms
 from few.utils.modeselector import ModeSelector
 from few.summation.interpolatedmodesum import CubicSplineInterpolant
+import few.waveform
 
 try:
     import cupy as xp
@@ -109,10 +110,134 @@ class WaveformTest(unittest.TestCase):
 
         self.assertLess(mm, 1e-4)
 
+        # test batching over several batches
+        slow_wave_batched = slow(
+            M, mu, p0, e0, theta, phi, dist, T=T, dt=dt, batch_size=500
+        )
+
+        self.assertEqual(len(slow_wave_batched), len(slow_wave))
+
+        mm = get_mismatch(slow_wave, slow_wave_batched, use_gpu=False)
+
+        self.assertLess(mm, 1e-4)
+
+        # test growth of the batched output buffer
+        slow._waveform_buffer = None
+        buffer = slow._get_waveform_buffer(10, np.complex128)
+        buffer[:10] = np.arange(10)
+        grown = slow._get_waveform_buffer(15, np.complex128, num_copy=10)
+
+        self.assertGreaterEqual(len(grown), 20)
+        self.assertTrue(np.all(grown[:10] == np.arange(10)))
+        self.assertIs(slow._get_waveform_buffer(15, np.complex128), grown)
+
+        # test single precision summation
+        slow_wave_fp32 = slow(
+            M,
+            mu,
+            p0,
+            e0,
+            theta,
+            phi,
+            dist,
+            T=T,
+            dt=dt,
+            batch_size=batch_size,
+            fp32=True,
+        )
+
+        self.assertEqual(slow_wave_fp32.dtype, np.complex64)
+
+        mm = get_mismatch(slow_wave, slow_wave_fp32, use_gpu=False)
+
+        self.assertLess(mm, 1e-4)
+
         # test_rk4
         fast.inspiral_kwargs["use_rk4"] = True
         fast_wave = fast(M, mu, p0, e0, theta, phi, dist, T=T, dt=dt)
 
+    def test_mode_selection_errors(self):
+
+        fast = FastSchwarzschildEccentricFlux(
+            inspiral_kwargs={"DENSE_STEPPING": 0, "max_init_len": int(1e3)},
+            amplitude_kwargs={"max_init_len": int(1e3)},
+            use_gpu=gpu_available,
+        )
+
+        args = (1e6, 1e1, 12.0, 0.3, np.pi / 3, np.pi / 4)
+        kwargs = dict(T=0.001, dt=15.0)
+
+        # mode outside of the model
+        with self.assertRaises(ValueError):
+            fast(*args, mode_selection=[(2, 2, 0), (2, 2, 31)], **kwargs)
+
+        # l outside of the model
+        with self.assertRaises(ValueError):
+            fast(*args, mode_selection=[(11, 2, 0)], **kwargs)
+
+        # non-integer mode index
+        with self.assertRaises(ValueError):
+            fast(*args, mode_selection=[(2, 2.5, 0)], **kwargs)
+
+        # strings other than "all"
+        with self.assertRaises(ValueError):
+            fast(*args, mode_selection="some", **kwargs)
+
+        # integer valued floats are still accepted
+        wave_float = fast(*args, mode_selection=[(2, 2.0, 0)], **kwargs)
+        wave_int = fast(*args, mode_selection=[(2, 2, 0)], **kwargs)
+
+        self.assertTrue(xp.allclose(wave_float, wave_int))
+
+    @unittest.skipIf(not gpu_available, "CuPy or a GPU is not available")
+    def test_gather_modes_gpu(self):
+        from few.waveform import _gather_modes_gpu
+
+        amp = RomanAmplitude(use_gpu=True)
+        ylm_gen = GetYlms(assume_positive_m=False, use_gpu=True)
+
+        p = xp.linspace(10.0, 14.0, 20)
+        e = xp.linspace(0.1, 0.7, 20)
+
+        teuk_modes = amp(p, e)
+        ylms = ylm_gen(amp.unique_l, amp.unique_m, np.pi / 3, np.pi / 4)[
+            xp.asarray(amp.inverse_lm)
+        ]
+
+        # includes m < 0 modes and m = 0
+        mode_selection = [(2, 2, 0), (3, -1, 2), (4, 0, -3), (7, -3, 1)]
+        l_in, m_in, n_in = np.asarray(mode_selection).T
+        keep_modes = amp._get_lmn_index(l_in, np.abs(m_in), n_in)
+        temp2 = keep_modes + amp.num_m_1_up * (keep_modes >= amp.num_m0)
+        ylmkeep = np.concatenate([keep_modes, temp2]).astype(np.int32)
+
+        # as with include_minus_m=False
+        fix_include_ms = np.full(2 * len(mode_selection), False)
+        fix_include_ms[len(mode_selection) :] = m_in > 0
+        fix_include_ms[: len(mode_selection)] = m_in < 0
+
+        keep_modes = xp.asarray(keep_modes)
+        ylmkeep = xp.asarray(ylmkeep)
+        fix_include_ms = xp.asarray(fix_include_ms)
+
+        check_ylms = ylms[ylmkeep]
+        check_ylms[fix_include_ms] = 0.0
+
+        # RomanAmplitude returns F-ordered amplitudes; also check C order
+        # and a strided view
+        teuk_c = xp.ascontiguousarray(teuk_modes)
+        self.assertFalse(teuk_modes.flags.c_contiguous)
+        self.assertTrue(teuk_c.flags.c_contiguous)
+
+        inputs = [teuk_modes, teuk_c, teuk_c[::2], teuk_modes[:1]]
+        for teuk in inputs:
+            teuk_in, ylms_in = _gather_modes_gpu(
+                teuk, ylms, keep_modes, ylmkeep, fix_include_ms
+            )
+
+            self.assertTrue(xp.all(teuk_in == teuk[:, keep_modes]))
+            self.assertTrue(xp.all(ylms_in == check_ylms))
+
 
 def amplitude_test(amp_class):
     # initialize ROMAN class
@@ -195,3 +320,24 @@ class ModuleTest(unittest.TestCase):
         x2 = np.sin(t) + 1j * np.cos(t)
         self.assertAlmostEqual(get_overlap(x0, x2), 0.499981442642142)
         self.assertAlmostEqual(1.0 - get_overlap(x0, x1), get_mismatch(x0, x1))
+
+    @unittest.skipIf(not few.waveform.numba_available, "numba is not installed")
+    def test_normalize_amplitudes_numba(self):
+
+        amp = RomanAmplitude()
+
+        p = np.linspace(10.0, 14.0, 20)
+        e = np.linspace(0.1, 0.7, 20)
+        amp_norm = np.linspace(0.5, 1.5, 20)
+
+        teuk_modes = amp(p, e)
+
+        # array expression used on GPUs or without numba
+        sq = teuk_modes.real * teuk_modes.real + teuk_modes.imag * teuk_modes.imag
+        amp_for_norm = np.sqrt(sq.sum(axis=1) + sq[:, amp.m0mask].sum(axis=1))
+        check = teuk_modes * (amp_norm / amp_for_norm)[:, None]
+
+        # numba kernel normalizes in place
+        few.waveform._normalize_amplitudes_cpu(teuk_modes, amp.m0mask, amp_norm)
+
+        self.assertTrue(np.allclose(teuk_modes, check, rtol=1e-12, atol=0.0))
@@ -273,6 +273,14 @@ class SchwarzschildEccentric(ParallelModuleBase, ABC):
         except AttributeError:
             self.lmn_indices = {tuple(md_i): i for i, md_i in enumerate(md.T)}
 
+        # lookup table from (l, m, n + nmax) to the mode index for m >= 0
+        # modes that are not in the model are marked with -1
+        self._lmn_lut = np.full(
+            (self.lmax + 1, self.lmax + 1, 2 * self.nmax + 1), -1, dtype=np.int32
+        )
+        for (l, m, n), i in self.lmn_indices.items():
+            self._lmn_lut[l, m, n + self.nmax] = i
+
         # store the mask as m != 0 is True
         self.m0mask = self.m_arr != 0
 
@@ -345,6 +353,37 @@ class SchwarzschildEccentric(ParallelModuleBase, ABC):
         """Return citations of this class"""
         return larger_few_citation + few_citation + few_software_citation
 
+    def _get_lmn_index(self, l, m, n):
+        """Vectorized lookup of mode indices.
+
+        This is the array equivalent of :code:`lmn_indices`.
+
+        args:
+            l (1D int np.ndarray): :math:`l` values.
+            m (1D int np.ndarray): :math:`m` values. Must be :math:`m\geq0`.
+            n (1D int np.ndarray): :math:`n` values.
+
+        Returns:
+            1D int32 np.ndarray: Index of each mode in l_arr, m_arr, n_arr.
+                Modes that are not in the model are given -1.
+
+        """
+        l, m, n = np.asarray(l), np.asarray(m), np.asarray(n)
+        inds = np.full(l.shape, -1, dtype=np.int32)
+
+        # only look up modes within the bounds of the table
+        in_table = (
+            (l >= 0)
+            & (l <= self.lmax)
+            & (m >= 0)
+            & (m <= self.lmax)
+            & (np.abs(n) <= self.nmax)
+        )
+        inds[in_table] = self._lmn_lut[
+            l[in_table], m[in_table], n[in_table] + self.nmax
+        ]
+        return inds
+
     def sanity_check_viewing_angles(self, theta, phi):
         """Sanity check on viewing angles.
 
@@ -385,10 +424,10 @@ class SchwarzschildEccentric(ParallelModuleBase, ABC):
 
         """
 
-        if np.any(e < 0.0):
+        if np.nanmin(e) < 0.0:
             raise ValueError("Members of e array are less than zero.")
 
-        if np.any(p < 0.0):
+        if np.nanmin(p) < 0.0:
             raise ValueError("Members of p array are less than zero.")
 
     def sanity_check_init(self, M, mu, p0, e0):
@@ -538,13 +577,13 @@ class Pn5AAK(ABC):
 
         """
 
-        if np.any(e < 0.0):
+        if np.nanmin(e) < 0.0:
             raise ValueError("Members of e array are less than zero.")
 
-        if np.any(p < 0.0):
+        if np.nanmin(p) < 0.0:
             raise ValueError("Members of p array are less than zero.")
 
-        if np.any(Y < -1.0) or np.any(Y > 1.0):
+        if np.nanmin(Y) < -1.0 or np.nanmax(Y) > 1.0:
             raise ValueError(
                 "Members of Y array are greater than 1.0 or less than -1.0."
             )
@@ -785,6 +824,11 @@ class SummationBase(ABC):
         """Return citation for this class"""
         return larger_few_citation + few_citation + few_software_citation
 
+    @property
+    def fp32_capability(self):
+        """Indicator if the summation can be performed in single precision"""
+        return False
+
     @classmethod
     def sum(self, *args, **kwargs):
         """Sum Generator
@@ -818,16 +862,20 @@ class SummationBase(ABC):
         T = n_pts * dt
         # determine the output array setup
 
+        # only the end points of t are needed here
+        # read them once to avoid repeated device to host transfers
+        t_start, t_end = float(t[0]), float(t[-1])
+
         # adjust based on if observations time is less than or more than trajectory time array
         # if the user wants zero-padding, add number of zero pad points
-        if T < t[-1].item():
-            num_pts = int((T - t[0]) / dt) + 1
+        if T < t_end:
+            num_pts = int((T - t_start) / dt) + 1
             num_pts_pad = 0
 
         else:
-            num_pts = int((t[-1] - t[0]) / dt) + 1
+            num_pts = int((t_end - t_start) / dt) + 1
             if self.pad_output:
-                num_pts_pad = int((T - t[0]) / dt) + 1 - num_pts
+                num_pts_pad = int((T - t_start) / dt) + 1 - num_pts
             else:
                 num_pts_pad = 0
 
@@ -133,14 +133,11 @@ class ModeSelector(ParallelModuleBase):
         """
 
         # get the power contribution of each mode including m < 0
+        # |A|^2 |Y|^2 avoids building the complex products
+        teuk_sq = teuk_modes.real * teuk_modes.real + teuk_modes.imag * teuk_modes.imag
+        ylm_sq = ylms.real * ylms.real + ylms.imag * ylms.imag
         power = (
-            self.xp.abs(
-                self.xp.concatenate(
-                    [teuk_modes, self.xp.conj(teuk_modes[:, self.m0mask])], axis=1
-                )
-                * ylms
-            )
-            ** 2
+            self.xp.concatenate([teuk_sq, teuk_sq[:, self.m0mask]], axis=1) * ylm_sq
         )
 
         # if noise weighting
@@ -198,9 +195,7 @@ class ModeSelector(ParallelModuleBase):
 
         # adjust the index arrays to make -m indices equal to +m indices
         # if +m or -m contributes, we keep both because of structure of CUDA kernel
-        temp = temp * (temp < self.num_m_zero_up) + (temp - self.num_m_1_up) * (
-            temp >= self.num_m_zero_up
-        )
+        temp = temp - self.num_m_1_up * (temp >= self.num_m_zero_up)
 
         # if +m or -m contributes, we keep both because of structure of CUDA kernel
         keep_modes = self.xp.unique(temp)
@@ -208,9 +203,7 @@ class ModeSelector(ParallelModuleBase):
         # set ylms
 
         # adust temp arrays specific to ylm setup
-        temp2 = keep_modes * (keep_modes < self.num_m0) + (
-            keep_modes + self.num_m_1_up
-        ) * (keep_modes >= self.num_m0)
+        temp2 = keep_modes + self.num_m_1_up * (keep_modes >= self.num_m0)
 
         # ylm duplicates the m = 0 unlike teuk_modes
         ylmkeep = self.xp.concatenate([keep_modes, temp2])
@@ -822,8 +822,9 @@ def wrapper(*args, **kwargs):
     for arg in args:
         if gpu:
             # cupy arrays
+            # data.ptr includes the offset of views into larger arrays
             if isinstance(arg, cp.ndarray):
-                targs.append(arg.data.mem.ptr)
+                targs.append(arg.data.ptr)
                 continue
 
         # numpy arrays
@@ -844,7 +845,7 @@ def wrapper(*args, **kwargs):
         if gpu:
             # cupy arrays
             if isinstance(arg, cp.ndarray):
-                tkwargs[key] = arg.data.mem.ptr
+                tkwargs[key] = arg.data.ptr
                 continue
 
         if isinstance(arg, np.ndarray):
@@ -18,6 +18,7 @@
 import sys
 import os
 from abc import ABC
+from functools import lru_cache
 
 import numpy as np
 from tqdm import tqdm
@@ -27,9 +28,22 @@ from scipy.interpolate import RectBivariateSpline
 try:
     import cupy as xp
 
+    gpu_available = True
+
 except (ImportError, ModuleNotFoundError) as e:
     import numpy as xp
 
+    gpu_available = False
+
+# numba is optional and only used to accelerate the CPU path
+try:
+    from numba import njit, prange
+
+    numba_available = True
+
+except (ImportError, ModuleNotFoundError) as e:
+    numba_available = False
+
 from few.utils.baseclasses import SchwarzschildEccentric, Pn5AAK, ParallelModuleBase
 from few.trajectory.inspiral import EMRIInspiral
 from few.amplitude.interp2dcubicspline import Interp2DAmplitude
@@ -44,6 +58,140 @@ from few.utils.citations import *
 from few.summation.interpolatedmodesum import InterpolatedModeSum
 
 
+if numba_available:
+
+    @njit(cache=True, parallel=True)
+    def _normalize_amplitudes_cpu(teuk_modes, m0mask, amp_norm):
+        """Normalize amplitudes in place on the CPU in a single pass.
+
+        args:
+            teuk_modes (2D complex128 np.ndarray): Teukolsky amplitudes for
+                :math:`m\geq0`. Shape: (number of trajectory points, number of modes).
+            m0mask (1D bool np.ndarray): True for modes with :math:`m>0`.
+            amp_norm (1D double np.ndarray): Flux-based amplitude normalization
+                at each trajectory point.
+
+        """
+        num_pts, num_modes = teuk_modes.shape
+        for i in prange(num_pts):
+            # m > 0 modes are counted twice to include m < 0
+            power = 0.0
+            for j in range(num_modes):
+                z = teuk_modes[i, j]
+                sq = z.real * z.real + z.imag * z.imag
+                if m0mask[j]:
+                    power += 2.0 * sq
+                else:
+                    power += sq
+
+            factor = amp_norm[i] / np.sqrt(power)
+            for j in range(num_modes):
+                teuk_modes[i, j] *= factor
+
+
+if gpu_available:
+
+    # gathers the kept amplitude columns and ylms in a single kernel launch
+    # the ylm gather is done by the first 2 * num_keep threads
+    _gather_modes_kernel = xp.ElementwiseKernel(
+        "raw T teuk, raw T ylm, raw int32 keep, raw int32 ylmkeep, raw bool ylm_zero, int64 stride_row, int64 stride_col, int32 num_keep",
+        "T teuk_out, raw T ylm_out",
+        """
+        ptrdiff_t row = i / num_keep;
+        ptrdiff_t col = i % num_keep;
+        teuk_out = teuk[row * stride_row + keep[col] * stride_col];
+        if (i < 2 * num_keep) {
+            ylm_out[i] = ylm_zero[i] ? T(0) : ylm[ylmkeep[i]];
+        }
+        """,
+        "few_gather_modes",
+    )
+
+    def _gather_modes_gpu(teuk_modes, ylms, keep_modes, ylmkeep, ylm_zero):
+        """Gather amplitudes and ylms of selected modes on the GPU.
+
+        This is equivalent to :code:`teuk_modes[:, keep_modes]` and
+        :code:`ylms[ylmkeep]` with the entries in :code:`ylm_zero` set to zero.
+
+        args:
+            teuk_modes (2D complex128 cp.ndarray): Teukolsky amplitudes.
+            ylms (1D complex128 cp.ndarray): Ylms for all modes.
+            keep_modes (1D int32 cp.ndarray): Indices of amplitude columns to keep.
+            ylmkeep (1D int32 cp.ndarray): Indices of ylms to keep.
+            ylm_zero (1D bool cp.ndarray): Kept ylms to set to zero.
+
+        Returns:
+            tuple: (teuk_modes_in, ylms_in).
+
+        """
+        # the kernel gathers the ylms with its first 2 * num_keep threads
+        # so it needs at least two rows of amplitudes to write all of them
+        # it also assumes non-negative strides
+        if teuk_modes.shape[0] < 2 or min(teuk_modes.strides) < 0:
+            ylms_in = ylms[ylmkeep]
+            ylms_in[ylm_zero] = 0.0 + 1j * 0.0
+            return teuk_modes[:, keep_modes], ylms_in
+
+        # read the amplitudes in place with their strides
+        # so only the kept columns are touched, whatever the memory order
+        stride_row, stride_col = (
+            stride // teuk_modes.itemsize for stride in teuk_modes.strides
+        )
+        span = (
+            (teuk_modes.shape[0] - 1) * stride_row
+            + (teuk_modes.shape[1] - 1) * stride_col
+            + 1
+        )
+        teuk_flat = xp.ndarray(
+            (span,), dtype=teuk_modes.dtype, memptr=teuk_modes.data
+        )
+
+        num_keep = len(keep_modes)
+
+        teuk_modes_in = xp.empty(
+            (teuk_modes.shape[0], num_keep), dtype=teuk_modes.dtype
+        )
+        ylms_in = xp.empty(2 * num_keep, dtype=ylms.dtype)
+
+        _gather_modes_kernel(
+            teuk_flat,
+            ylms,
+            keep_modes,
+            ylmkeep,
+            ylm_zero,
+            np.int64(stride_row),
+            np.int64(stride_col),
+            np.int32(num_keep),
+            teuk_modes_in,
+            ylms_in,
+        )
+        return teuk_modes_in, ylms_in
+
+
+@lru_cache(maxsize=8)
+def _get_batch_slices(length, batch_size):
+    """Slices splitting a trajectory into batches.
+
+    This is cached because repeated calls (e.g. in parameter estimation)
+    usually have the same trajectory length and batch size.
+
+    args:
+        length (int): Length of the trajectory.
+        batch_size (int): Size of each batch. If -1, no batching.
+
+    Returns:
+        tuple: Slice objects for each batch.
+
+    """
+    if batch_size == -1:
+        return (slice(0, length),)
+
+    return tuple(
+        slice(start, min(start + batch_size, length))
+        for start in range(0, length, batch_size)
+    )
+
+
 class GenerateEMRIWaveform:
     """Generic waveform generator for data analysis
 
@@ -431,6 +579,33 @@ class SchwarzschildEccentricWaveformBase(
         # normalize amplitudes to flux at each step from trajectory
         self.normalize_amps = normalize_amps
 
+        # bind backend functions used in __call__ to avoid repeated lookups
+        self._asarray = self.xp.asarray
+        self._concatenate = self.xp.concatenate
+        self._arange = self.xp.arange
+        self._sqrt = self.xp.sqrt
+        self._zeros_like = self.xp.zeros_like
+        self._empty = self.xp.empty
+
+        # (l, m, n) stacked so mode indices are gathered in one step
+        # int32 is required by the summation kernels
+        self._lmn = self.xp.stack([self.l_arr, self.m_arr, self.n_arr]).astype(
+            self.xp.int32
+        )
+
+        # ylms are computed on the host, so keep the unique (l, m) values there
+        # adjust with .get method for cupy
+        try:
+            self._unique_l_host = self.unique_l.get()
+            self._unique_m_host = self.unique_m.get()
+
+        except AttributeError:
+            self._unique_l_host = self.unique_l
+            self._unique_m_host = self.unique_m
+
+        # keep the expansion index on the device to avoid a transfer on each call
+        self._inverse_lm_dev = self.xp.asarray(self.inverse_lm)
+
         # kwargs that are passed to the inspiral call function
         self.inspiral_kwargs = inspiral_kwargs
 
@@ -465,6 +640,15 @@ class SchwarzschildEccentricWaveformBase(
             np.unique(y_in), np.unique(e_in), norm.reshape(num_e, num_y).T
         )
 
+        # reusable output buffer for batched waveforms
+        self._waveform_buffer = None
+
+        # stream and pinned host buffer for trajectory transfers to the gpu
+        self._h2d_stream = (
+            self.xp.cuda.Stream(non_blocking=True) if self.use_gpu else None
+        )
+        self._pinned_staging = None
+
     @property
     def citation(self):
         """Return citations related to this module"""
@@ -494,6 +678,7 @@ class SchwarzschildEccentricWaveformBase(
         batch_size=-1,
         mode_selection=None,
         include_minus_m=True,
+        fp32=False,
     ):
         """Call function for SchwarzschildEccentric models.
 
@@ -541,19 +726,77 @@ class SchwarzschildEccentricWaveformBase(
             include_minus_m (bool, optional): If True, then include -m modes when
                 computing a mode with m. This only effects modes if :code:`mode_selection`
                 is a list of specific modes. Default is True.
+            fp32 (bool, optional): If True, perform the summation in single
+                precision. This is useful for preliminary searches, but
+                reduces accuracy. It is only available if the summation module
+                supports it. Default is False.
 
         Returns:
-            1D complex128 xp.ndarray: The output waveform.
+            1D complex128 (complex64 if :code:`fp32`) xp.ndarray: The output waveform.
 
         Raises:
             ValueError: user selections are not allowed.
 
         """
 
+        if fp32 and not self.create_waveform.fp32_capability:
+            raise ValueError(
+                "fp32 is True, but the summation module does not support single precision."
+            )
+
         # makes sure viewing angles are allowable
         theta, phi = self.sanity_check_viewing_angles(theta, phi)
         self.sanity_check_init(M, mu, p0, e0)
 
+        # check the mode selection and build its index arrays once per call
+        # before the trajectory and amplitudes are computed
+        if isinstance(mode_selection, str):
+            if mode_selection != "all":
+                raise ValueError("If mode selection is a string, must be `all`.")
+
+        elif isinstance(mode_selection, list):
+            if mode_selection == []:
+                raise ValueError("If mode selection is a list, cannot be empty.")
+
+            # build the index arrays on the host
+            # then transfer them to the device in one step
+            modes_in = np.asarray(mode_selection)
+            modes_int = modes_in.astype(np.int32)
+            if modes_in.shape != (len(mode_selection), 3) or np.any(
+                modes_int != modes_in
+            ):
+                raise ValueError(
+                    "mode_selection must contain (l, m, n) tuples of integers."
+                )
+
+            l_in, m_in, n_in = modes_int.T
+
+            # keep modes only works with m>=0
+            keep_modes = self._get_lmn_index(l_in, np.abs(m_in), n_in)
+
+            if np.any(keep_modes < 0):
+                raise ValueError(
+                    "Modes in mode_selection are not available in this model."
+                )
+
+            # for removing opposite m modes
+            fix_include_ms = np.full(2 * len(mode_selection), False)
+            if not include_minus_m:
+                # minus m modes blocked
+                fix_include_ms[len(mode_selection) :] = m_in > 0
+
+                # positive m modes blocked
+                fix_include_ms[: len(mode_selection)] = m_in < 0
+
+            temp2 = keep_modes + self.num_m_1_up * (keep_modes >= self.num_m0)
+            ylmkeep = np.concatenate([keep_modes, temp2]).astype(np.int32)
+
+            keep_modes = self._asarray(keep_modes)
+            ylmkeep = self._asarray(ylmkeep)
+            fix_include_ms = self._asarray(fix_include_ms)
+
+            self.ls, self.ms, self.ns = self._lmn[:, keep_modes]
+
         # get trajectory
         (t, p, e, x, Phi_phi, Phi_theta, Phi_r) = self.inspiral_generator(
             M,
@@ -579,132 +822,96 @@ class SchwarzschildEccentricWaveformBase(
 
         self.end_time = t[-1]
         # convert for gpu
-        t = self.xp.asarray(t)
-        p = self.xp.asarray(p)
-        e = self.xp.asarray(e)
-        Phi_phi = self.xp.asarray(Phi_phi)
-        Phi_r = self.xp.asarray(Phi_r)
-        amp_norm = self.xp.asarray(amp_norm)
+        # on gpus, the transfers run on a separate stream
+        # so they overlap with the ylm computation
+        (t, p, e, Phi_phi, Phi_r, amp_norm) = self._to_device(
+            t, p, e, Phi_phi, Phi_r, amp_norm
+        )
 
         # get ylms only for unique (l,m) pairs
         # then expand to all (lmn with self.inverse_lm)
-        ylms = self.ylm_gen(self.unique_l, self.unique_m, theta, phi).copy()[
-            self.inverse_lm
+        ylms = self.ylm_gen(self._unique_l_host, self._unique_m_host, theta, phi)[
+            self._inverse_lm_dev
         ]
 
-        # split into batches
+        # trajectory arrays must be on the device before they are used
+        if self.use_gpu:
+            self._h2d_stream.synchronize()
 
-        if batch_size == -1 or self.allow_batching is False:
-            inds_split_all = [self.xp.arange(len(t))]
-        else:
-            split_inds = []
-            i = 0
-            while i < len(t):
-                i += batch_size
-                if i >= len(t):
-                    break
-                split_inds.append(i)
+        # split into batches
+        # slices give views, so no index arrays or copies are needed
+        if self.allow_batching is False:
+            batch_size = -1
 
-            inds_split_all = self.xp.split(self.xp.arange(len(t)), split_inds)
+        batch_slices = _get_batch_slices(len(t), batch_size)
 
         # select tqdm if user wants to see progress
-        iterator = enumerate(inds_split_all)
+        iterator = enumerate(batch_slices)
         iterator = tqdm(iterator, desc="time batch") if show_progress else iterator
 
         if show_progress:
-            print("total:", len(inds_split_all))
+            print("total:", len(batch_slices))
 
-        for i, inds_in in iterator:
+        for i, sl in iterator:
 
             # get subsections of the arrays for each batch
-            t_temp = t[inds_in]
-            p_temp = p[inds_in]
-            e_temp = e[inds_in]
-            Phi_phi_temp = Phi_phi[inds_in]
-            Phi_r_temp = Phi_r[inds_in]
-            amp_norm_temp = amp_norm[inds_in]
+            t_temp = t[sl]
+            p_temp = p[sl]
+            e_temp = e[sl]
+            Phi_phi_temp = Phi_phi[sl]
+            Phi_r_temp = Phi_r[sl]
+            amp_norm_temp = amp_norm[sl]
 
             # amplitudes
             teuk_modes = self.amplitude_generator(p_temp, e_temp)
 
             # normalize by flux produced in trajectory
-            if self.normalize_amps:
-                amp_for_norm = self.xp.sum(
-                    self.xp.abs(
-                        self.xp.concatenate(
-                            [teuk_modes, self.xp.conj(teuk_modes[:, self.m0mask])],
-                            axis=1,
-                        )
-                    )
-                    ** 2,
-                    axis=1,
-                ) ** (1 / 2)
+            if self.normalize_amps and numba_available and self.xp is np:
+                _normalize_amplitudes_cpu(teuk_modes, self.m0mask, amp_norm_temp)
+
+            elif self.normalize_amps:
+                # power of each m >= 0 mode; m > 0 modes are counted twice
+                # to include their m < 0 counterparts
+                teuk_re, teuk_im = teuk_modes.real, teuk_modes.imag
+                sq = teuk_re * teuk_re + teuk_im * teuk_im
+                amp_for_norm = self._sqrt(
+                    sq.sum(axis=1) + sq[:, self.m0mask].sum(axis=1)
+                )
 
                 # normalize
                 factor = amp_norm_temp / amp_for_norm
-                teuk_modes = teuk_modes * factor[:, np.newaxis]
+                # amplitude modules return new arrays, so scale in place
+                teuk_modes *= factor[:, None]
 
             # different types of mode selection
             # sets up ylm and teuk_modes properly for summation
             if isinstance(mode_selection, str):
 
                 # use all modes
-                if mode_selection == "all":
-                    self.ls = self.l_arr[: teuk_modes.shape[1]]
-                    self.ms = self.m_arr[: teuk_modes.shape[1]]
-                    self.ns = self.n_arr[: teuk_modes.shape[1]]
-
-                    keep_modes = self.xp.arange(teuk_modes.shape[1])
-                    temp2 = keep_modes * (keep_modes < self.num_m0) + (
-                        keep_modes + self.num_m_1_up
-                    ) * (keep_modes >= self.num_m0)
+                self.ls, self.ms, self.ns = self._lmn[:, : teuk_modes.shape[1]]
 
-                    ylmkeep = self.xp.concatenate([keep_modes, temp2])
-                    ylms_in = ylms[ylmkeep]
-                    teuk_modes_in = teuk_modes
+                keep_modes = self._arange(teuk_modes.shape[1])
+                temp2 = keep_modes + self.num_m_1_up * (keep_modes >= self.num_m0)
 
-                else:
-                    raise ValueError("If mode selection is a string, must be `all`.")
+                ylmkeep = self._concatenate([keep_modes, temp2])
+                ylms_in = ylms[ylmkeep]
+                teuk_modes_in = teuk_modes
 
             # get a specific subset of modes
             elif isinstance(mode_selection, list):
-                if mode_selection == []:
-                    raise ValueError("If mode selection is a list, cannot be empty.")
-
-                keep_modes = self.xp.zeros(len(mode_selection), dtype=self.xp.int32)
-
-                # for removing opposite m modes
-                fix_include_ms = self.xp.full(2 * len(mode_selection), False)
-                for jj, lmn in enumerate(mode_selection):
-                    l, m, n = tuple(lmn)
-
-                    # keep modes only works with m>=0
-                    lmn_in = (l, abs(m), n)
-                    keep_modes[jj] = self.xp.int32(self.lmn_indices[lmn_in])
-
-                    if not include_minus_m:
-                        if m > 0:
-                            # minus m modes blocked
-                            fix_include_ms[len(mode_selection) + jj] = True
-                        elif m < 0:
-                            # positive m modes blocked
-                            fix_include_ms[jj] = True
-
-                self.ls = self.l_arr[keep_modes]
-                self.ms = self.m_arr[keep_modes]
-                self.ns = self.n_arr[keep_modes]
-
-                temp2 = keep_modes * (keep_modes < self.num_m0) + (
-                    keep_modes + self.num_m_1_up
-                ) * (keep_modes >= self.num_m0)
+                # on gpus, gather amplitudes and ylms in one kernel
+                if self.use_gpu:
+                    teuk_modes_in, ylms_in = _gather_modes_gpu(
+                        teuk_modes, ylms, keep_modes, ylmkeep, fix_include_ms
+                    )
 
-                ylmkeep = self.xp.concatenate([keep_modes, temp2])
-                ylms_in = ylms[ylmkeep]
+                else:
+                    ylms_in = ylms[ylmkeep]
 
-                # remove modes if include_minus_m is False
-                ylms_in[fix_include_ms] = 0.0 + 1j * 0.0
+                    # remove modes if include_minus_m is False
+                    ylms_in[fix_include_ms] = 0.0 + 1j * 0.0
 
-                teuk_modes_in = teuk_modes[:, keep_modes]
+                    teuk_modes_in = teuk_modes[:, keep_modes]
 
             # mode selection based on input module
             else:
@@ -713,9 +920,9 @@ class SchwarzschildEccentricWaveformBase(
                     0.0,
                     p_temp,
                     e_temp,
-                    self.xp.zeros_like(e_temp),
+                    self._zeros_like(e_temp),
                 )
-                modeinds = [self.l_arr, self.m_arr, self.n_arr]
+                modeinds = list(self._lmn)
                 (
                     teuk_modes_in,
                     ylms_in,
@@ -729,6 +936,14 @@ class SchwarzschildEccentricWaveformBase(
             # store number of modes for external information
             self.num_modes_kept = teuk_modes_in.shape[1]
 
+            # cast to single precision for the summation
+            # phases are wrapped first to keep their precision
+            if fp32:
+                teuk_modes_in = teuk_modes_in.astype(self.xp.complex64)
+                ylms_in = ylms_in.astype(self.xp.complex64)
+                Phi_phi_temp = (Phi_phi_temp % (2 * np.pi)).astype(self.xp.float32)
+                Phi_r_temp = (Phi_r_temp % (2 * np.pi)).astype(self.xp.float32)
+
             # create waveform
             waveform_temp = self.create_waveform(
                 t_temp,
@@ -746,13 +961,27 @@ class SchwarzschildEccentricWaveformBase(
                 include_minus_m=include_minus_m,
             )
 
-            # if batching, need to add the waveform
-            if i > 0:
-                waveform = self.xp.concatenate([waveform, waveform_temp])
-
-            # return entire waveform
-            else:
+            # return entire waveform if not batching
+            if len(batch_slices) == 1:
                 waveform = waveform_temp
+                continue
+
+            # if batching, fill the output buffer
+            if i == 0:
+                waveform = self._get_waveform_buffer(len(t), waveform_temp.dtype)
+                offset = 0
+
+            n = waveform_temp.shape[0]
+            if offset + n > waveform.shape[0]:
+                waveform = self._get_waveform_buffer(
+                    offset + n, waveform.dtype, num_copy=offset
+                )
+
+            waveform[offset : offset + n] = waveform_temp
+            offset += n
+
+        if len(batch_slices) > 1:
+            waveform = waveform[:offset]
 
         if dist is not None:
             dist_dimensionless = (dist * Gpc) / (mu * MRSUN_SI)
@@ -762,6 +991,104 @@ class SchwarzschildEccentricWaveformBase(
 
         return waveform / dist_dimensionless
 
+    def _to_device(self, *arrs):
+        """Move arrays to the backend of this class.
+
+        Arrays that are already backend arrays are returned as they are.
+        On GPUs, host arrays are transferred together with
+        :meth:`_to_device_async`.
+
+        args:
+            *arrs (1D double np.ndarray or xp.ndarray): Arrays to move.
+
+        Returns:
+            tuple: Backend arrays in the same order as the inputs.
+
+        """
+        out = list(arrs)
+        host_inds = [
+            i for i, arr in enumerate(arrs) if not isinstance(arr, self.xp.ndarray)
+        ]
+        host_arrs = [arrs[i] for i in host_inds]
+
+        if self.use_gpu and len(host_arrs) > 0:
+            dev_arrs = self._to_device_async(*host_arrs)
+        else:
+            dev_arrs = [self._asarray(arr) for arr in host_arrs]
+
+        for i, arr_dev in zip(host_inds, dev_arrs):
+            out[i] = arr_dev
+
+        return tuple(out)
+
+    def _to_device_async(self, *arrs):
+        """Transfer host arrays to the GPU asynchronously.
+
+        The arrays are staged in a reusable pinned host buffer and copied on
+        :code:`self._h2d_stream`. The stream must be synchronized before the
+        returned arrays are used.
+
+        args:
+            *arrs (1D double np.ndarray): Host arrays to transfer.
+
+        Returns:
+            list: CuPy arrays in the same order as the inputs.
+
+        """
+        arrs = [np.ascontiguousarray(arr, dtype=np.float64) for arr in arrs]
+        total = sum(arr.size for arr in arrs)
+
+        if self._pinned_staging is None or self._pinned_staging.size < total:
+            mem = self.xp.cuda.alloc_pinned_memory(total * np.float64().itemsize)
+            self._pinned_staging = np.frombuffer(mem, np.float64, total)
+
+        # order the copies after work already queued on the current stream
+        # so reused device memory is not overwritten while still in use
+        self._h2d_stream.wait_event(self.xp.cuda.get_current_stream().record())
+
+        out = []
+        offset = 0
+        for arr in arrs:
+            staging = self._pinned_staging[offset : offset + arr.size]
+            staging[:] = arr.ravel()
+
+            arr_dev = self._empty(arr.shape, dtype=self.xp.float64)
+            arr_dev.set(staging.reshape(arr.shape), stream=self._h2d_stream)
+
+            out.append(arr_dev)
+            offset += arr.size
+
+        return out
+
+    def _get_waveform_buffer(self, length, dtype, num_copy=0):
+        """Output buffer for batched waveform generation.
+
+        The buffer is stored and reused for subsequent calls. Its contents are
+        overwritten on each call. If the stored buffer is too small, it is
+        replaced by one at least twice as large so repeated growth stays
+        linear in the output length.
+
+        args:
+            length (int): Minimum number of points in the buffer.
+            dtype (obj): Data type of the buffer.
+            num_copy (int, optional): Number of leading points to keep when
+                the buffer grows. Default is 0.
+
+        Returns:
+            1D xp.ndarray: Output buffer with at least :code:`length` points.
+
+        """
+        buffer = self._waveform_buffer
+        if buffer is None or buffer.dtype != dtype:
+            buffer = self._waveform_buffer = self._empty(length, dtype=dtype)
+
+        elif buffer.shape[0] < length:
+            new_buffer = self._empty(max(length, 2 * buffer.shape[0]), dtype=dtype)
+            new_buffer[:num_copy] = buffer[:num_copy]
+            buffer = self._waveform_buffer = new_buffer
+
+        return buffer
+
 
 class FastSchwarzschildEccentricFlux(SchwarzschildEccentricWaveformBase):
     """Prebuilt model for fast Schwarzschild eccentric flux-based waveforms.